@@ -1,5 +1,6 @@
 // Configuration
 const CITIES_URL = "data/timezones-complete.json";
+const MAP_LAYER_URL = "data/timezones-map-layer.json";
 const STORAGE_KEY = "global-meeting-helper-v1";
 const THEME_STORAGE_KEY = "global-meeting-helper-theme";
 
@@ -7,6 +8,7 @@ const THEME_STORAGE_KEY = "global-meeting-helper-theme";
 let allCities = [];              // all cities from JSON
 let allCitiesByNameLower = {};   // name.toLowerCase() -> city object
 let citiesInPoll = [];           // selected cities (time zones / cities)
+let mapLayer = null;             // pre-projected, clustered map points (optional)
 
 // User timezone
 const USER_TZ = Intl.DateTimeFormat().resolvedOptions().timeZone || "UTC";
@@ -208,6 +210,8 @@ async function loadCitiesJson() {
         tz: String(tz),
         lat,
         lon,
+        // Projected once here; renderMap only reads it
+        mapPos: projectLatLonToSvg(lat, lon),
         observesDst,
         people: 1
       };
@@ -1277,6 +1281,61 @@ const MAP_LON_C = 835.0654922175859;
 const MAP_LAT_A = -5.277002539105562;
 const MAP_LAT_B = 601.6106278617472;
 
+// Level-of-detail background layer built by data/archive/build_map_layer.py
+const MAP_MAX_POINTS_PER_LEVEL = 400;
+const MAP_MIN_CELL_PX = 20; // smallest on-screen cell size before switching to a coarser level
+const MAP_RESIZE_DEBOUNCE_MS = 200;
+let mapLevelDrawn = null;        // level used by the last renderMap call
+let mapResizeTimer = null;
+
+async function loadMapLayer() {
+  try {
+    const res = await fetch(MAP_LAYER_URL);
+    if (!res.ok) {
+      throw new Error("HTTP " + res.status + " while loading " + MAP_LAYER_URL);
+    }
+    const data = await res.json();
+    if (!data || !Array.isArray(data.levels)) {
+      throw new Error("map layer file must have a levels array");
+    }
+    mapLayer = data;
+  } catch (e) {
+    // The layer is decorative; the participants map works without it
+    console.warn(e);
+    mapLayer = null;
+  }
+}
+
+// Pick the finest level whose cells are still at least MAP_MIN_CELL_PX on screen
+function pickMapLevel(svg) {
+  if (!mapLayer || !mapLayer.levels.length) return null;
+
+  const renderedWidth = svg.getBoundingClientRect().width || MAP_VIEWBOX_WIDTH;
+  const scale = renderedWidth / MAP_VIEWBOX_WIDTH;
+
+  let chosen = mapLayer.levels[0];
+  mapLayer.levels.forEach(level => {
+    if (level.cellSize * scale >= MAP_MIN_CELL_PX && level.cellSize < chosen.cellSize) {
+      chosen = level;
+    }
+  });
+  return chosen;
+}
+
+// The level depends on the rendered width, so redraw when it would change
+function initMapResize() {
+  window.addEventListener("resize", () => {
+    clearTimeout(mapResizeTimer);
+    mapResizeTimer = setTimeout(() => {
+      const svg = document.getElementById("participantsMap");
+      if (!svg || !mapLevelDrawn) return;
+      if (pickMapLevel(svg) !== mapLevelDrawn) {
+        renderMap();
+      }
+    }, MAP_RESIZE_DEBOUNCE_MS);
+  });
+}
+
 function projectLatLonToSvg(lat, lon) {
   if (!Number.isFinite(lat) || !Number.isFinite(lon)) {
     return null;
@@ -1296,6 +1355,7 @@ function renderMap() {
   while (svg.firstChild) {
     svg.removeChild(svg.firstChild);
   }
+  mapLevelDrawn = null;
 
   if (citiesInPoll.length < 2) {
     if (cardMap) cardMap.style.display = "none";
@@ -1318,8 +1378,22 @@ function renderMap() {
   bg.setAttribute("fill", "transparent");
   svg.appendChild(bg);
 
+  const level = pickMapLevel(svg);
+  mapLevelDrawn = level;
+  if (level && Array.isArray(level.points)) {
+    const count = Math.min(level.points.length / 2, MAP_MAX_POINTS_PER_LEVEL);
+    for (let i = 0; i < count; i++) {
+      const dot = document.createElementNS("http://www.w3.org/2000/svg", "circle");
+      dot.setAttribute("cx", String(level.points[2 * i]));
+      dot.setAttribute("cy", String(level.points[2 * i + 1]));
+      dot.setAttribute("r", "2");
+      dot.setAttribute("class", "map-context");
+      svg.appendChild(dot);
+    }
+  }
+
   citiesInPoll.forEach(city => {
-    const proj = projectLatLonToSvg(city.lat, city.lon);
+    const proj = city.mapPos;
     if (!proj) return;
 
     const people = Math.max(1, Number(city.people) || 1);
@@ -1348,7 +1422,7 @@ async function init() {
   // Initialize theme first to avoid flash
   initTheme();
   
-  await loadCitiesJson();
+  await Promise.all([loadCitiesJson(), loadMapLayer()]);
   initEvents();
   
   // Add theme toggle event listener
@@ -1356,6 +1430,7 @@ async function init() {
   if (themeToggle) {
     themeToggle.addEventListener('click', toggleTheme);
   }
+  initMapResize();
 
   initUserTimezoneInfo();
   loadCitiesFromHash();
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import sys
+
+from merge_cities import dataset_hash, record_key
+
+# Usage: python apply_delta.py <manifest.json> <base.json> [<output.json>]
+# Brings base.json up to the latest version listed in the manifest by applying
+# the deltas written by merge_cities.py, verifying each one along the way.
+
+def apply_delta(base_records, delta):
+    """
+    Apply a delta to a release and return the new release.
+    Raises ValueError if the base or the result does not match the delta hashes.
+    """
+    if dataset_hash(base_records) != delta['baseSha256']:
+        raise ValueError(f"Base does not match version {delta['from']}")
+
+    by_key = {record_key(e): e for e in base_records}
+
+    for key in delta['removed']:
+        by_key.pop(tuple(key), None)
+    for entry in delta['changed']:
+        by_key[record_key(entry)] = entry
+    for entry in delta['added']:
+        by_key[record_key(entry)] = entry
+
+    result = sorted(by_key.values(), key=lambda x: x.get('city', ''))
+
+    if dataset_hash(result) != delta['targetSha256']:
+        raise ValueError(f"Result does not match version {delta['to']}")
+
+    return result
+
+def load_verified_delta(manifest, entry, manifest_dir):
+    """
+    Read the delta file listed in a manifest entry and check it against the
+    manifest: file hash, from/to versions and the hashes of both versions.
+    """
+    path = os.path.join(manifest_dir, entry['file'])
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    if hashlib.sha256(raw).hexdigest() != entry['sha256']:
+        raise ValueError(f"{entry['file']} does not match its hash in the manifest")
+
+    delta = json.loads(raw.decode('utf-8'))
+    if delta['from'] != entry['from'] or delta['to'] != entry['to']:
+        raise ValueError(f"{entry['file']} is not the v{entry['from']} -> v{entry['to']} delta")
+
+    hashes = {v['version']: v['sha256'] for v in manifest['versions']}
+    if delta['baseSha256'] != hashes.get(delta['from']) or \
+            delta['targetSha256'] != hashes.get(delta['to']):
+        raise ValueError(f"{entry['file']} does not match the version hashes in the manifest")
+
+    return delta
+
+def update_to_latest(base_records, manifest, manifest_dir):
+    """
+    Apply deltas from the manifest until base_records reaches the latest version.
+    Returns (records, list of applied deltas).
+    """
+    versions = {v['sha256']: v['version'] for v in manifest['versions']}
+    version = versions.get(dataset_hash(base_records))
+    if version is None:
+        raise ValueError("Base is not a version listed in the manifest, download the full file")
+
+    deltas_from = {d['from']: d for d in manifest['deltas']}
+    applied = []
+    records = base_records
+
+    while version < manifest['latest']:
+        entry = deltas_from.get(version)
+        if entry is None:
+            raise ValueError(f"No delta from version {version}, download the full file")
+        delta = load_verified_delta(manifest, entry, manifest_dir)
+        records = apply_delta(records, delta)
+        applied.append(delta)
+        version = delta['to']
+
+    return records, applied
+
+def main(argv):
+    if len(argv) not in (3, 4):
+        print("Usage: python apply_delta.py <manifest.json> <base.json> [<output.json>]")
+        return 2
+
+    manifest_path, base_path = argv[1], argv[2]
+    output_path = argv[3] if len(argv) == 4 else base_path
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    with open(base_path, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+
+    try:
+        result, applied = update_to_latest(base, manifest, os.path.dirname(manifest_path))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if not applied:
+        print(f"Already at the latest version (v{manifest['latest']}).")
+        return 0
+
+    for delta in applied:
+        print(f"Applied v{delta['from']} -> v{delta['to']} "
+              f"({len(delta['added'])} added, {len(delta['changed'])} changed, "
+              f"{len(delta['removed'])} removed).")
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+
+    print(f"Verified against {manifest_path} and saved to {output_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
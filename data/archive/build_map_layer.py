@@ -0,0 +1,102 @@
+import json
+import os
+
+# --- Configuration ---
+# Reads the release published by merge_cities.py, writes next to it in data/
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INPUT_FILE = os.path.join(DATA_DIR, 'timezones-complete.json')
+OUTPUT_FILE = os.path.join(DATA_DIR, 'timezones-map-layer.json')
+
+# Must match the SVG viewBox and projection in app.js (section 14. Map)
+MAP_VIEWBOX_WIDTH = 1800
+MAP_VIEWBOX_HEIGHT = 900
+MAP_LON_M = 4.951703040211287
+MAP_LON_C = 835.0654922175859
+MAP_LAT_A = -5.277002539105562
+MAP_LAT_B = 601.6106278617472
+
+# Grid cell size (in SVG units) for each level, coarsest first
+LEVEL_CELL_SIZES = [180, 90, 45]
+MAX_POINTS_PER_LEVEL = 400
+
+def project(lat, lon):
+    """
+    Same linear projection as projectLatLonToSvg in app.js.
+    """
+    x = MAP_LON_M * lon + MAP_LON_C
+    y = MAP_LAT_A * lat + MAP_LAT_B
+    return x, y
+
+def rank(point, cell_size):
+    """
+    Sort key for choosing a cell's representative (higher wins).
+    Most records have no population (capitals added by merge_cities.py), so
+    cities with a known population always win; without one, the city nearest
+    the centre of its cell is used, which spreads the points evenly.
+    """
+    x, y, population, city = point
+    cx = (x // cell_size + 0.5) * cell_size
+    cy = (y // cell_size + 0.5) * cell_size
+    distance = (x - cx) ** 2 + (y - cy) ** 2
+    return (population is not None, population or 0, -distance, city)
+
+def cluster(points, cell_size):
+    """
+    Keep the highest-ranked city in each grid cell.
+    points: list of (x, y, population, city), population None when unknown
+    """
+    best = {}
+    for p in points:
+        x, y = p[0], p[1]
+        cell = (int(x // cell_size), int(y // cell_size))
+        current = best.get(cell)
+        if current is None or rank(p, cell_size) > rank(current, cell_size):
+            best[cell] = p
+
+    # Best first, so the cap drops the lowest-ranked representatives
+    reps = sorted(best.values(), key=lambda p: rank(p, cell_size), reverse=True)
+    return reps[:MAX_POINTS_PER_LEVEL]
+
+def build_map_layer():
+    print(f"Loading {INPUT_FILE}...")
+    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+        cities = json.load(f)
+
+    points = []
+    skipped = 0
+    for entry in cities:
+        lat = entry.get('lat')
+        lon = entry.get('lon')
+        if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+            skipped += 1
+            continue
+        x, y = project(lat, lon)
+        if not (0 <= x < MAP_VIEWBOX_WIDTH and 0 <= y < MAP_VIEWBOX_HEIGHT):
+            skipped += 1
+            continue
+        points.append((x, y, entry.get('population'), entry.get('city', '')))
+
+    print(f"Projected {len(points)} cities ({skipped} skipped).")
+
+    levels = []
+    for cell_size in LEVEL_CELL_SIZES:
+        reps = cluster(points, cell_size)
+        # Flat [x0, y0, x1, y1, ...] array to keep the file small
+        flat = []
+        for x, y, _, _ in reps:
+            flat.extend([round(x, 1), round(y, 1)])
+        levels.append({'cellSize': cell_size, 'points': flat})
+        print(f"  -> Level {cell_size}: {len(reps)} points")
+
+    layer = {
+        'viewBox': [MAP_VIEWBOX_WIDTH, MAP_VIEWBOX_HEIGHT],
+        'levels': levels,
+    }
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(layer, f, separators=(',', ':'))
+
+    print(f"Saved to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    build_map_layer()
@@ -1,12 +1,20 @@
+import hashlib
 import json
+import os
 import unicodedata
 
 # --- Configuration ---
+# Inputs live next to this script; the release is published in data/
+ARCHIVE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.dirname(ARCHIVE_DIR)
+
 FILES_TO_MERGE = [
-    'timezones-filtered.json',          # The >1 Million population list
-    'timezones-filtered-capitals.json'  # The Capitals list
+    os.path.join(ARCHIVE_DIR, 'timezones-filtered.json'),          # The >1 Million population list
+    os.path.join(ARCHIVE_DIR, 'timezones-filtered-capitals.json')  # The Capitals list
 ]
-OUTPUT_FILE = 'timezones-complete.json'
+OUTPUT_FILE = os.path.join(DATA_DIR, 'timezones-complete.json')
+MANIFEST_FILE = os.path.join(DATA_DIR, 'timezones-manifest.json')
+DELTA_DIR = os.path.join(DATA_DIR, 'deltas')
 
 def normalize(text):
     """
@@ -18,6 +26,126 @@ def normalize(text):
         if unicodedata.category(c) != 'Mn'
     ).lower().strip()
 
+def record_key(entry):
+    """
+    Stable identity of a city across releases, e.g. ('paris', 'FR').
+    """
+    return (normalize(entry.get('city')), entry.get('countryCode'))
+
+def dataset_hash(records):
+    """
+    SHA-256 of a release, independent of record order and JSON formatting.
+    """
+    canonical = sorted(
+        json.dumps(entry, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        for entry in records
+    )
+    digest = hashlib.sha256()
+    for line in canonical:
+        digest.update(line.encode('utf-8'))
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+def compute_delta(old_records, new_records):
+    """
+    Compare two releases by record_key.
+    Returns added/changed records in full and removed records as keys.
+    """
+    old_by_key = {record_key(e): e for e in old_records}
+    new_by_key = {record_key(e): e for e in new_records}
+
+    added = [e for k, e in new_by_key.items() if k not in old_by_key]
+    changed = [e for k, e in new_by_key.items()
+               if k in old_by_key and old_by_key[k] != e]
+    removed = [list(k) for k in old_by_key if k not in new_by_key]
+
+    return {
+        'added': sorted(added, key=lambda x: x.get('city', '')),
+        'changed': sorted(changed, key=lambda x: x.get('city', '')),
+        'removed': sorted(removed),
+    }
+
+def load_json(path, default=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+def save_manifest(manifest):
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Manifest at version {manifest['latest']} ({MANIFEST_FILE})")
+
+def write_release(final_list):
+    """
+    Record final_list as a new version in the manifest and write the delta
+    from the previous release (the OUTPUT_FILE about to be overwritten).
+    """
+    previous = load_json(OUTPUT_FILE)
+    manifest = load_json(MANIFEST_FILE, {'latest': 0, 'versions': [], 'deltas': []})
+
+    # First run with an existing release: register it as version 1
+    bootstrapped = previous is not None and not manifest['versions']
+    if bootstrapped:
+        manifest['versions'].append({
+            'version': 1,
+            'sha256': dataset_hash(previous),
+            'count': len(previous),
+        })
+        manifest['latest'] = 1
+
+    new_hash = dataset_hash(final_list)
+    latest = manifest['versions'][-1] if manifest['versions'] else None
+
+    if latest and latest['sha256'] == new_hash:
+        print(f"Dataset unchanged (version {latest['version']}), no delta written.")
+        if bootstrapped:
+            save_manifest(manifest)
+        return
+
+    new_version = manifest['latest'] + 1
+
+    if latest and previous is not None:
+        if dataset_hash(previous) != latest['sha256']:
+            print(f"Warning: {OUTPUT_FILE} does not match version {latest['version']} "
+                  f"in {MANIFEST_FILE}, skipping delta.")
+        else:
+            delta = compute_delta(previous, final_list)
+            delta.update({
+                'from': latest['version'],
+                'to': new_version,
+                'baseSha256': latest['sha256'],
+                'targetSha256': new_hash,
+            })
+            os.makedirs(DELTA_DIR, exist_ok=True)
+            delta_path = os.path.join(DELTA_DIR, f"timezones-v{latest['version']}-v{new_version}.json")
+            with open(delta_path, 'w', encoding='utf-8') as f:
+                json.dump(delta, f, indent=2, ensure_ascii=False)
+            with open(delta_path, 'rb') as f:
+                delta_sha = hashlib.sha256(f.read()).hexdigest()
+
+            manifest['deltas'].append({
+                'from': latest['version'],
+                'to': new_version,
+                # Relative to the manifest, i.e. to data/
+                'file': os.path.relpath(delta_path, DATA_DIR).replace(os.sep, '/'),
+                'sha256': delta_sha,
+            })
+            print(f"Delta v{latest['version']} -> v{new_version}: "
+                  f"{len(delta['added'])} added, {len(delta['changed'])} changed, "
+                  f"{len(delta['removed'])} removed.")
+            print(f"Saved to {delta_path}")
+
+    manifest['versions'].append({
+        'version': new_version,
+        'sha256': new_hash,
+        'count': len(final_list),
+    })
+    manifest['latest'] = new_version
+
+    save_manifest(manifest)
+
 def merge_files():
     final_list = []
     seen_keys = set()
@@ -35,12 +163,9 @@ def merge_files():
             new_entries = 0
             
             for entry in data:
-                city = entry.get('city')
-                code = entry.get('countryCode')
-                
                 # Create a unique key for this city
                 # Example key: ('paris', 'fr')
-                key = (normalize(city), code)
+                key = record_key(entry)
                 
                 if key not in seen_keys:
                     seen_keys.add(key)
@@ -60,6 +185,8 @@ def merge_files():
 
     print(f"\nMerge complete.")
     print(f"Total unique cities: {len(final_list)}")
+
+    write_release(final_list)
     
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         json.dump(final_list, f, indent=2)